@@ -2,22 +2,68 @@ import contextlib
 
 with contextlib.redirect_stdout(None):
     import pygame
+import argparse
 import sys
 from system.cpu import Chip8CPU
+from system.debugger import Chip8Debugger
 from system.input import Chip8Input
 from system.graphics import Chip8Graphics
 from system.sound import Chip8Sound
+from utils.disassembler import analyze_file
 
 
-def main(rom_file):
+def create_debugger(cpu, args):
+    if not (args.breakpoints or args.watchpoints or args.conditions or args.trace):
+        return None
+    debugger = Chip8Debugger(cpu, trace_size=args.trace)
+
+    def on_break(debugger):
+        print(f"Break: {debugger.break_reason}")
+        print(debugger.state())
+        if debugger.trace is not None and args.trace_file:
+            debugger.trace.dump(args.trace_file)
+            print(f"Trace written to {args.trace_file}")
+
+    debugger.on_break = on_break
+    for address in args.breakpoints:
+        debugger.break_at(address)
+    for address in args.watchpoints:
+        debugger.watch(address)
+    for register, value in args.conditions:
+        debugger.break_when(register, value)
+    return debugger
+
+
+def parse_condition(value):
+    register, _, target = value.partition("=")
+    if len(register) != 2 or register[0].upper() != "V" or not target:
+        raise argparse.ArgumentTypeError(f"expected Vx=value, got '{value}'")
+    return int(register[1], 16), int(target, 0)
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {number}")
+    return number
+
+
+def main(rom_file, args):
     cpu = Chip8CPU()
     input_handler = Chip8Input()
     graphics = Chip8Graphics(width=640, height=320, rom_file=rom_file)
     sound = Chip8Sound()
     cpu.load_game(rom_file)
+    analysis = analyze_file(rom_file)
+    if args.warnings:
+        for warning in analysis.warnings:
+            print(f"Warning: {warning}", file=sys.stderr)
+    cpu.predecode(analysis.code_addresses())
+    debugger = create_debugger(cpu, args)
     running = True
     while running:
-        cpu.emulate_cycle()
+        if debugger is None or not debugger.paused:
+            cpu.emulate_cycle()
         running = input_handler.process_events(cpu)
         input_handler.set_keys()
         cpu.keyboard = input_handler.key
@@ -29,12 +75,66 @@ def main(rom_file):
         if input_handler.reset_requested:
             cpu.reset()
             cpu.load_game(rom_file)
+            if debugger is not None:
+                debugger.reset()
+            cpu.predecode(analysis.code_addresses())
+            if debugger is not None:
+                debugger.update_hooks()
             input_handler.reset_requested = False
+        if debugger is not None:
+            if input_handler.resume_requested:
+                debugger.resume()
+            elif input_handler.step_requested:
+                debugger.step()
+        input_handler.resume_requested = False
+        input_handler.step_requested = False
+    if debugger is not None and debugger.trace is not None and args.trace_file:
+        debugger.trace.dump(args.trace_file)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python main.py [ROM file]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="CHIP-8 interpreter")
+    parser.add_argument("rom_file", help="ROM file to run")
+    parser.add_argument(
+        "--warnings",
+        action="store_true",
+        help="print static analysis warnings about the ROM to stderr",
+    )
+    parser.add_argument(
+        "--break",
+        dest="breakpoints",
+        action="append",
+        default=[],
+        type=lambda value: int(value, 0),
+        help="pause before executing the instruction at this address",
+    )
+    parser.add_argument(
+        "--watch",
+        dest="watchpoints",
+        action="append",
+        default=[],
+        type=lambda value: int(value, 0),
+        help="pause before Fx33/Fx55 writes to this address",
+    )
+    parser.add_argument(
+        "--break-when",
+        dest="conditions",
+        action="append",
+        default=[],
+        type=parse_condition,
+        help="pause when a register has a value, e.g. V3=0x10",
+    )
+    parser.add_argument(
+        "--trace",
+        type=non_negative_int,
+        default=0,
+        help="record the last N executed instructions",
+    )
+    parser.add_argument(
+        "--trace-file",
+        default="trace.bin",
+        help="where to write the trace on a break and on exit (default: trace.bin)",
+    )
+    args = parser.parse_args()
 
-    main(sys.argv[1])
+    main(args.rom_file, args)
@@ -17,7 +17,9 @@ class Chip8CPU:
         self.waiting_for_keypress = False
         self.key_register = None
         self.opcode = 0
+        self.decoded = {}
         self.last_timer_update = time.time()
+        self.breakpoints = {}
         self.load_fontset()
 
     def reset(self):
@@ -33,6 +35,7 @@ class Chip8CPU:
         self.waiting_for_keypress = False
         self.key_register = None
         self.opcode = 0
+        self.decoded = {}
         self.last_timer_update = time.time()
         self.load_fontset()
 
@@ -135,6 +138,26 @@ class Chip8CPU:
             else:
                 raise ValueError("Game size exceeds available memory")
 
+    def predecode(self, addresses):
+        """Decode the instructions at the given addresses ahead of execution."""
+        self.decoded = {}
+        for address in addresses:
+            if address in self.breakpoints:
+                continue
+            opcode = int(self.memory[address]) << 8 | int(self.memory[address + 1])
+            self.decoded[address] = self.decode(opcode)
+
+    @staticmethod
+    def decode(opcode):
+        return (
+            opcode,
+            (opcode & 0x0F00) >> 8,
+            (opcode & 0x00F0) >> 4,
+            opcode & 0x000F,
+            opcode & 0x00FF,
+            opcode & 0x0FFF,
+        )
+
     def emulate_cycle(self):
         if not self.waiting_for_keypress:
             self.fetch_opcode()
@@ -148,14 +171,19 @@ class Chip8CPU:
             self.last_timer_update = current_time
 
     def fetch_opcode(self):
-        self.opcode = self.memory[self.pc] << 8 | self.memory[self.pc + 1]
+        self.opcode = int(self.memory[self.pc]) << 8 | int(self.memory[self.pc + 1])
 
     def execute_opcode(self):
-        x = (self.opcode & 0x0F00) >> 8
-        y = (self.opcode & 0x00F0) >> 4
-        n = self.opcode & 0x000F
-        nn = self.opcode & 0x00FF
-        nnn = self.opcode & 0x0FFF
+        decoded = self.decoded.get(self.pc)
+        if decoded is None or decoded[0] != self.opcode:
+            # Not pre-decoded, or the program has overwritten this instruction.
+            # Breakpoint addresses are never pre-decoded, so hooks only cost
+            # anything on this path.
+            hook = self.breakpoints.get(self.pc)
+            if hook is not None and hook(self):
+                return
+            decoded = self.decode(self.opcode)
+        _, x, y, n, nn, nnn = decoded
 
         if self.opcode == 0x00E0:  # 00E0 - CLS
             """Clear the display."""
@@ -210,7 +238,7 @@ class Chip8CPU:
 
         elif self.opcode & 0xF000 == 0x7000:  # 7xnn - ADD Vx, byte
             """Set Vx = Vx + nn."""
-            self.V[x] = (self.V[x] + nn) & 0xFF
+            self.V[x] = (int(self.V[x]) + nn) & 0xFF
             self.pc += 2
 
         elif self.opcode & 0xF00F == 0x8000:  # 8xy0 - LD Vx, Vy
@@ -285,7 +313,7 @@ class Chip8CPU:
         elif self.opcode & 0xF000 == 0xB000:  # Bnnn - JP V0, addr
             """Jump to location nnn + V0."""
             # jump to nnn + the highest nibble of nnn
-            self.pc = nnn + self.V[0x0]
+            self.pc = nnn + int(self.V[0x0])
 
         elif self.opcode & 0xF000 == 0xC000:  # Cxnn - RND Vx, byte
             """Set Vx = random byte AND nn."""
@@ -350,12 +378,12 @@ class Chip8CPU:
 
         elif self.opcode & 0xF0FF == 0xF01E:  # Fx1E - ADD I, Vx
             """Set I = I + Vx."""
-            self.I = (self.I + self.V[x]) & 0xFFF
+            self.I = (self.I + int(self.V[x])) & 0xFFF
             self.pc += 2
 
         elif self.opcode & 0xF0FF == 0xF029:  # Fx29 - LD F, Vx
             """Set I = location of sprite for digit Vx."""
-            self.I = 0x50 + (self.V[x] * 5)
+            self.I = 0x50 + (int(self.V[x]) * 5)
             self.pc += 2
 
         elif self.opcode & 0xF0FF == 0xF033:  # Fx33 - LD B, Vx
@@ -0,0 +1,244 @@
+import numpy as np
+
+TRACE_MAGIC = b"C8TR"
+TRACE_VERSION = 1
+TRACE_DTYPE = np.dtype(
+    [
+        ("pc", "<u2"),
+        ("opcode", "<u2"),
+        ("I", "<u2"),
+        ("V", "u1", (16,)),
+    ]
+)
+TRACE_HEADER_DTYPE = np.dtype(
+    [("magic", "S4"), ("version", "<u2"), ("entry_size", "<u2"), ("count", "<u4")]
+)
+
+PROGRAM_START = 0x200
+MEMORY_END = 0xFFE
+
+
+class TraceRing:
+    """Fixed-size ring buffer of the most recently executed instructions."""
+
+    def __init__(self, size=1024):
+        self.entries = np.zeros(size, dtype=TRACE_DTYPE)
+        self.index = 0
+        self.count = 0
+
+    def record(self, cpu):
+        entry = self.entries[self.index]
+        entry["pc"] = cpu.pc
+        entry["opcode"] = cpu.opcode
+        entry["I"] = cpu.I
+        entry["V"] = cpu.V
+        self.index = (self.index + 1) % len(self.entries)
+        if self.count < len(self.entries):
+            self.count += 1
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+    def ordered(self):
+        """Return the recorded entries, oldest first."""
+        if self.count < len(self.entries):
+            return self.entries[: self.count].copy()
+        return np.concatenate((self.entries[self.index :], self.entries[: self.index]))
+
+    def dump(self, filename):
+        entries = self.ordered()
+        header = np.array(
+            [(TRACE_MAGIC, TRACE_VERSION, TRACE_DTYPE.itemsize, len(entries))],
+            dtype=TRACE_HEADER_DTYPE,
+        )
+        with open(filename, "wb") as file:
+            file.write(header.tobytes())
+            file.write(entries.tobytes())
+
+
+def load_trace(filename):
+    """Read a trace written by TraceRing.dump, oldest entry first."""
+    with open(filename, "rb") as file:
+        data = file.read()
+    if len(data) < TRACE_HEADER_DTYPE.itemsize:
+        raise ValueError(f"{filename} is not a CHIP-8 trace file")
+    header = np.frombuffer(data, dtype=TRACE_HEADER_DTYPE, count=1)[0]
+    if header["magic"] != TRACE_MAGIC or header["version"] != TRACE_VERSION:
+        raise ValueError(f"{filename} is not a CHIP-8 trace file")
+    if header["entry_size"] != TRACE_DTYPE.itemsize:
+        raise ValueError(f"{filename} has an unsupported entry size")
+    return np.frombuffer(
+        data,
+        dtype=TRACE_DTYPE,
+        count=int(header["count"]),
+        offset=TRACE_HEADER_DTYPE.itemsize,
+    )
+
+
+class Chip8Debugger:
+    """Breakpoints, watchpoints and an execution trace for a Chip8CPU.
+
+    The debugger registers a hook in ``cpu.breakpoints`` only at the
+    addresses that need one: PC breakpoints, and the Fx33/Fx55 instructions
+    in memory when a watchpoint is set. Register conditions, tracing and
+    single-stepping have to see every instruction, so they hook the whole
+    program area. With nothing armed the CPU runs at full speed.
+    """
+
+    def __init__(self, cpu, trace_size=0):
+        self.cpu = cpu
+        self.pc_breakpoints = set()
+        self.watchpoints = set()
+        self.conditions = []
+        self.trace = TraceRing(trace_size) if trace_size else None
+        self.paused = False
+        self.break_reason = None
+        self.stepping = False
+        self.resume_address = None
+        self.on_break = None
+        self.hooked = set()
+        self.predecoded = {}
+        self.update_hooks()
+
+    def break_at(self, address):
+        self.pc_breakpoints.add(address)
+        self.update_hooks()
+
+    def watch(self, address, length=1):
+        """Break before Fx33 or Fx55 writes to any of the given addresses."""
+        self.watchpoints.update(range(address, address + length))
+        self.update_hooks()
+
+    def break_when(self, register, value):
+        self.break_if(
+            lambda cpu: cpu.V[register] == value, f"V{register:X} == {value:#04x}"
+        )
+
+    def break_if(self, condition, description="condition"):
+        """Break when ``condition(cpu)`` changes from false to true."""
+        self.conditions.append([condition, description, False])
+        self.update_hooks()
+
+    def clear(self):
+        self.pc_breakpoints.clear()
+        self.watchpoints.clear()
+        self.conditions.clear()
+        self.update_hooks()
+
+    def reset(self):
+        """Clear the pause state and all hooks after the CPU is reset.
+
+        Call update_hooks() once the CPU has pre-decoded the program again.
+        """
+        self.paused = False
+        self.stepping = False
+        self.resume_address = None
+        self.break_reason = None
+        for condition in self.conditions:
+            condition[2] = False
+        for address in self.hooked:
+            self.cpu.breakpoints.pop(address, None)
+        self.hooked = set()
+        self.predecoded = {}
+
+    def resume(self):
+        if self.paused:
+            self.resume_address = self.cpu.pc
+        self.paused = False
+        self.stepping = False
+        self.update_hooks()
+
+    def step(self):
+        """Execute one instruction and pause again."""
+        if self.paused:
+            self.resume_address = self.cpu.pc
+        self.paused = False
+        self.stepping = True
+        self.update_hooks()
+
+    def watched_instructions(self):
+        memory = self.cpu.memory
+        addresses = set()
+        for address in range(PROGRAM_START, MEMORY_END):
+            if memory[address] >> 4 == 0xF and memory[address + 1] in (0x33, 0x55):
+                addresses.add(address)
+        return addresses
+
+    def update_hooks(self):
+        if self.conditions or self.trace is not None or self.stepping:
+            wanted = set(range(PROGRAM_START, MEMORY_END))
+        else:
+            wanted = set(self.pc_breakpoints)
+            if self.watchpoints:
+                wanted |= self.watched_instructions()
+
+        breakpoints = self.cpu.breakpoints
+        decoded = self.cpu.decoded
+        for address in self.hooked - wanted:
+            del breakpoints[address]
+            if address in self.predecoded:
+                decoded[address] = self.predecoded.pop(address)
+        for address in wanted - self.hooked:
+            breakpoints[address] = self.hook
+            # Force the CPU onto its slow decode path at this address
+            if address in decoded:
+                self.predecoded[address] = decoded.pop(address)
+        self.hooked = wanted
+
+    def hook(self, cpu):
+        if self.paused:
+            return True
+        if self.resume_address == cpu.pc:
+            # Let the instruction we stopped at run once
+            self.resume_address = None
+        else:
+            reason = "step" if self.stepping else self.check(cpu)
+            if reason is not None:
+                self.pause(reason)
+                return True
+        if self.trace is not None:
+            self.trace.record(cpu)
+        return False
+
+    def check(self, cpu):
+        pc = int(cpu.pc)
+        reason = None
+        # Conditions are evaluated on every hooked instruction so that they
+        # only fire on the transition from false to true
+        for condition in self.conditions:
+            result = bool(condition[0](cpu))
+            if result and not condition[2] and reason is None:
+                reason = f"{condition[1]} at {pc:#05x}"
+            condition[2] = result
+        if pc in self.pc_breakpoints:
+            return f"breakpoint at {pc:#05x}"
+        if self.watchpoints:
+            opcode = int(cpu.opcode)
+            x = (opcode & 0x0F00) >> 8
+            if opcode & 0xF0FF == 0xF033:
+                length = 3
+            elif opcode & 0xF0FF == 0xF055:
+                length = x + 1
+            else:
+                length = 0
+            for address in range(int(cpu.I), int(cpu.I) + length):
+                if address in self.watchpoints:
+                    return f"write to {address:#05x} at {pc:#05x}"
+        return reason
+
+    def pause(self, reason):
+        self.paused = True
+        self.stepping = False
+        self.break_reason = reason
+        if self.on_break is not None:
+            self.on_break(self)
+
+    def state(self):
+        cpu = self.cpu
+        registers = " ".join(f"V{i:X}={int(v):02X}" for i, v in enumerate(cpu.V))
+        return (
+            f"PC={int(cpu.pc):03X} OP={int(cpu.opcode):04X} I={int(cpu.I):03X} "
+            f"SP={cpu.sp} DT={int(cpu.delay_timer)} ST={int(cpu.sound_timer)}\n"
+            f"{registers}"
+        )
@@ -24,6 +24,8 @@ class Chip8Input:
             pygame.K_v: 0xF,
         }
         self.reset_requested = False
+        self.resume_requested = False
+        self.step_requested = False
 
     def set_keys(self):
         keys = pygame.key.get_pressed()
@@ -45,6 +47,10 @@ class Chip8Input:
                             break
                 if event.key in self.key_map:
                     self.key[self.key_map[event.key]] = 1
+                elif event.key == pygame.K_p:
+                    self.resume_requested = True
+                elif event.key == pygame.K_n:
+                    self.step_requested = True
             elif event.type == pygame.KEYUP:
                 if event.key in self.key_map:
                     self.key[self.key_map[event.key]] = 0
@@ -0,0 +1,403 @@
+import argparse
+import os
+import sys
+
+from utils.opcodes import decode_opcode
+
+PROGRAM_START = 0x200
+
+# Values of ProgramAnalysis.byte_map
+UNREACHABLE = 0
+CODE = 1
+DATA = 2
+
+OPERAND_FORMATS = {
+    "SCD": "SCD {n}",
+    "SCU": "SCU {n}",
+    "SYS": "SYS {nnn:#05x}",
+    "JP": "JP {nnn:#05x}",
+    "CALL": "CALL {nnn:#05x}",
+    "SE Vx, byte": "SE V{x:X}, {nn:#04x}",
+    "SNE Vx, byte": "SNE V{x:X}, {nn:#04x}",
+    "SE Vx, Vy": "SE V{x:X}, V{y:X}",
+    "SAVE": "SAVE V{x:X} - V{y:X}",
+    "LOAD": "LOAD V{x:X} - V{y:X}",
+    "LD Vx, byte": "LD V{x:X}, {nn:#04x}",
+    "ADD Vx, byte": "ADD V{x:X}, {nn:#04x}",
+    "LD Vx, Vy": "LD V{x:X}, V{y:X}",
+    "OR": "OR V{x:X}, V{y:X}",
+    "AND": "AND V{x:X}, V{y:X}",
+    "XOR": "XOR V{x:X}, V{y:X}",
+    "ADD Vx, Vy": "ADD V{x:X}, V{y:X}",
+    "SUB": "SUB V{x:X}, V{y:X}",
+    "SHR": "SHR V{x:X}, V{y:X}",
+    "SUBN": "SUBN V{x:X}, V{y:X}",
+    "SHL": "SHL V{x:X}, V{y:X}",
+    "SNE Vx, Vy": "SNE V{x:X}, V{y:X}",
+    "LD I": "LD I, {nnn:#05x}",
+    "JP V0": "JP V0, {nnn:#05x}",
+    "RND": "RND V{x:X}, {nn:#04x}",
+    "DRW": "DRW V{x:X}, V{y:X}, {n}",
+    "DRW16": "DRW V{x:X}, V{y:X}, 0",
+    "SKP": "SKP V{x:X}",
+    "SKNP": "SKNP V{x:X}",
+    "PLANE": "PLANE {x}",
+    "LD Vx, DT": "LD V{x:X}, DT",
+    "LD K": "LD V{x:X}, K",
+    "LD DT, Vx": "LD DT, V{x:X}",
+    "LD ST": "LD ST, V{x:X}",
+    "ADD I": "ADD I, V{x:X}",
+    "LD F": "LD F, V{x:X}",
+    "LD HF": "LD HF, V{x:X}",
+    "LD B": "LD B, V{x:X}",
+    "PITCH": "PITCH V{x:X}",
+    "LD [I], Vx": "LD [I], V{x:X}",
+    "LD Vx, [I]": "LD V{x:X}, [I]",
+    "LD R": "LD R, V{x:X}",
+    "LD VR": "LD V{x:X}, R",
+}
+
+SKIP_MNEMONICS = {
+    "SE Vx, byte",
+    "SNE Vx, byte",
+    "SE Vx, Vy",
+    "SNE Vx, Vy",
+    "SKP",
+    "SKNP",
+}
+
+# Instructions that store to memory at I, with the number of bytes written
+MEMORY_WRITES = {
+    "LD B": lambda x, y: 3,
+    "LD [I], Vx": lambda x, y: x + 1,
+    "SAVE": lambda x, y: abs(y - x) + 1,
+}
+
+# Instructions that change I to a value that cannot be known statically
+I_MODIFIERS = {"ADD I", "LD F", "LD HF", "LD [I], Vx", "LD Vx, [I]"}
+
+
+def format_instruction(opcode, long_address=0):
+    """Return the assembly text for an opcode, e.g. ``LD V3, 0x05``."""
+    mnemonic = decode_opcode(opcode)
+    if mnemonic is None:
+        return f"DW {opcode:#06x}"
+    if mnemonic == "LD I LONG":
+        return f"LD I, {long_address:#06x}"
+    operand_format = OPERAND_FORMATS.get(mnemonic, mnemonic)
+    return operand_format.format(
+        x=(opcode & 0x0F00) >> 8,
+        y=(opcode & 0x00F0) >> 4,
+        n=opcode & 0x000F,
+        nn=opcode & 0x00FF,
+        nnn=opcode & 0x0FFF,
+    )
+
+
+class BasicBlock:
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self.instructions = []
+        self.successors = []
+
+    def __repr__(self):
+        return f"BasicBlock({self.start:#05x}-{self.end:#05x})"
+
+
+class ProgramAnalysis:
+    """Static control-flow analysis of a ROM loaded at ``base``.
+
+    Code is discovered by following every statically known edge from the
+    entry point: jumps, calls and returns, both outcomes of the skip
+    instructions, and the base address of ``JP V0, nnn``, which is also
+    recorded in ``indirect_jumps`` since its real target depends on V0.
+    """
+
+    def __init__(self, data, base=PROGRAM_START, entry=PROGRAM_START):
+        self.data = bytes(data)
+        self.base = base
+        self.end = base + len(self.data)
+        self.entry = entry
+        self.instructions = {}  # address -> (opcode, size)
+        self.successors = {}  # address -> intra-procedural successors
+        self.calls = {}  # address -> subroutine address
+        self.indirect_jumps = set()
+        self.invalid = set()  # addresses reached by code that do not decode
+        self.data_references = set()
+        self.byte_map = bytearray(len(self.data))
+        self.blocks = {}
+        self.call_graph = {}
+        self.warnings = []
+
+        self.trace_code()
+        self.build_blocks()
+        self.build_call_graph()
+        self.build_byte_map()
+        self.find_self_modifying_code()
+        self.find_unreachable_regions()
+
+    def word(self, address):
+        offset = address - self.base
+        return self.data[offset] << 8 | self.data[offset + 1]
+
+    def contains(self, address, size=2):
+        return self.base <= address and address + size <= self.end
+
+    def instruction_size(self, address):
+        if self.contains(address) and self.word(address) == 0xF000:
+            return 4
+        return 2
+
+    def trace_code(self):
+        pending = [self.entry]
+        while pending:
+            address = pending.pop()
+            if address in self.instructions or address in self.invalid:
+                continue
+            if not self.contains(address):
+                self.invalid.add(address)
+                continue
+            opcode = self.word(address)
+            mnemonic = decode_opcode(opcode)
+            size = 4 if opcode == 0xF000 else 2
+            if mnemonic is None or not self.contains(address, size):
+                self.invalid.add(address)
+                continue
+
+            self.instructions[address] = (opcode, size)
+            nnn = opcode & 0x0FFF
+            next_address = address + size
+            if mnemonic in ("RET", "EXIT"):
+                successors = []
+            elif mnemonic == "JP":
+                successors = [nnn]
+            elif mnemonic == "JP V0":
+                self.indirect_jumps.add(address)
+                successors = [nnn]
+            elif mnemonic == "CALL":
+                self.calls[address] = nnn
+                pending.append(nnn)
+                successors = [next_address]
+            elif mnemonic in SKIP_MNEMONICS:
+                successors = [
+                    next_address,
+                    next_address + self.instruction_size(next_address),
+                ]
+            else:
+                successors = [next_address]
+                if mnemonic == "LD I":
+                    self.data_references.add(nnn)
+                elif mnemonic == "LD I LONG":
+                    self.data_references.add(self.word(address + 2))
+            self.successors[address] = successors
+            pending.extend(successors)
+
+    def build_blocks(self):
+        leaders = {self.entry}
+        leaders.update(self.calls.values())
+        for address, successors in self.successors.items():
+            opcode, size = self.instructions[address]
+            if successors != [address + size] or address in self.calls:
+                leaders.update(successors)
+
+        block = None
+        for address in sorted(self.instructions):
+            opcode, size = self.instructions[address]
+            if block is not None and (address in leaders or address != block.end):
+                # Fall through into the next block
+                block.successors = self.successors[block.instructions[-1]]
+                block = None
+            if block is None:
+                block = BasicBlock(address)
+                self.blocks[address] = block
+            block.instructions.append(address)
+            block.end = address + size
+            successors = self.successors[address]
+            if successors != [block.end] or address in self.calls:
+                block.successors = successors
+                block = None
+        if block is not None:
+            block.successors = self.successors[block.instructions[-1]]
+
+    def build_call_graph(self):
+        functions = [self.entry] + sorted(set(self.calls.values()))
+        for function in functions:
+            if function not in self.instructions:
+                continue
+            callees = set()
+            seen = set()
+            pending = [function]
+            while pending:
+                address = pending.pop()
+                if address in seen or address not in self.instructions:
+                    continue
+                seen.add(address)
+                if address in self.calls:
+                    callees.add(self.calls[address])
+                pending.extend(self.successors[address])
+            self.call_graph[function] = sorted(callees)
+
+    def build_byte_map(self):
+        for address, (opcode, size) in self.instructions.items():
+            offset = address - self.base
+            self.byte_map[offset : offset + size] = bytes([CODE]) * size
+        for address in self.data_references:
+            offset = address - self.base
+            while (
+                0 <= offset < len(self.byte_map)
+                and self.byte_map[offset] == UNREACHABLE
+            ):
+                self.byte_map[offset] = DATA
+                offset += 1
+
+    def find_self_modifying_code(self):
+        for block in self.blocks.values():
+            target = None
+            for address in block.instructions:
+                opcode, size = self.instructions[address]
+                mnemonic = decode_opcode(opcode)
+                x = (opcode & 0x0F00) >> 8
+                y = (opcode & 0x00F0) >> 4
+                if mnemonic in MEMORY_WRITES and target is not None:
+                    length = MEMORY_WRITES[mnemonic](x, y)
+                    written = [
+                        target + i
+                        for i in range(length)
+                        if self.contains(target + i, 1)
+                        and self.byte_map[target + i - self.base] == CODE
+                    ]
+                    if written:
+                        self.warnings.append(
+                            f"{address:#05x}: {format_instruction(opcode)} writes to "
+                            f"code at {written[0]:#05x} (self-modifying)"
+                        )
+                if mnemonic == "LD I":
+                    target = opcode & 0x0FFF
+                elif mnemonic == "LD I LONG":
+                    target = self.word(address + 2)
+                elif mnemonic in I_MODIFIERS:
+                    target = None
+
+    def find_unreachable_regions(self):
+        for start, end in self.regions(UNREACHABLE):
+            self.warnings.append(
+                f"{start:#05x}-{end - 1:#05x}: {end - start} unreachable bytes"
+            )
+        for address in sorted(self.indirect_jumps):
+            self.warnings.append(
+                f"{address:#05x}: indirect jump, code after "
+                f"{self.word(address) & 0x0FFF:#05x} may be missed"
+            )
+
+    def regions(self, kind):
+        """Yield (start, end) address ranges whose bytes are all of ``kind``."""
+        start = None
+        for offset, value in enumerate(self.byte_map):
+            if value == kind and start is None:
+                start = offset
+            elif value != kind and start is not None:
+                yield start + self.base, offset + self.base
+                start = None
+        if start is not None:
+            yield start + self.base, self.end
+
+    def code_addresses(self):
+        return sorted(self.instructions)
+
+    def disassemble(self):
+        """Yield listing lines with code, data and labels for the whole ROM."""
+        labels = set(self.blocks)
+        offset = 0
+        while offset < len(self.data):
+            address = offset + self.base
+            if address in labels:
+                prefix = "sub" if address in self.call_graph else "loc"
+                yield f"{prefix}_{address:03X}:"
+            if address in self.instructions:
+                opcode, size = self.instructions[address]
+                long_address = self.word(address + 2) if size == 4 else 0
+                raw = self.data[offset : offset + size].hex().upper()
+                text = format_instruction(opcode, long_address)
+                yield f"    {address:03X}  {raw:<8}  {text}"
+                offset += size
+            else:
+                value = self.data[offset]
+                kind = "DB" if self.byte_map[offset] == DATA else "DB?"
+                yield f"    {address:03X}  {value:02X}        {kind} {value:#04x}"
+                offset += 1
+
+
+def analyze_file(file_path, base=PROGRAM_START):
+    with open(file_path, "rb") as file:
+        return ProgramAnalysis(file.read(), base=base)
+
+
+def print_summary(file_path, analysis):
+    code = analysis.byte_map.count(CODE)
+    data = analysis.byte_map.count(DATA)
+    print(
+        f"{os.path.basename(file_path)}: {len(analysis.instructions)} instructions, "
+        f"{len(analysis.blocks)} blocks, {len(analysis.call_graph)} functions, "
+        f"{code} code / {data} data / {len(analysis.data) - code - data} unreachable bytes"
+    )
+
+
+def print_listing(analysis, show_blocks, show_calls):
+    for line in analysis.disassemble():
+        print(line)
+    if show_blocks:
+        print()
+        for block in analysis.blocks.values():
+            successors = ", ".join(f"{s:#05x}" for s in block.successors)
+            print(f"{block.start:#05x}-{block.end - 1:#05x} -> {successors or '-'}")
+    if show_calls:
+        print()
+        for function, callees in analysis.call_graph.items():
+            names = ", ".join(f"sub_{callee:03X}" for callee in callees)
+            print(f"sub_{function:03X} -> {names or '-'}")
+
+
+def list_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                file_path = os.path.join(path, filename)
+                if not filename.startswith(".") and os.path.isfile(file_path):
+                    yield file_path
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Disassemble CHIP-8 ROMs by following their control flow."
+    )
+    parser.add_argument("paths", nargs="+", help="ROM files or directories of ROMs")
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="print one summary line per ROM instead of a listing",
+    )
+    parser.add_argument("--blocks", action="store_true", help="list basic blocks")
+    parser.add_argument("--calls", action="store_true", help="print the call graph")
+    parser.add_argument(
+        "--quiet", action="store_true", help="do not print analysis warnings"
+    )
+    args = parser.parse_args(argv)
+
+    file_paths = list(list_files(args.paths))
+    summary = args.summary or len(file_paths) > 1
+    for file_path in file_paths:
+        analysis = analyze_file(file_path)
+        if summary:
+            print_summary(file_path, analysis)
+        else:
+            print_listing(analysis, args.blocks, args.calls)
+        if not args.quiet:
+            for warning in analysis.warnings:
+                print(f"    warning: {warning}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
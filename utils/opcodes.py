@@ -0,0 +1,111 @@
+# Instructions that only exist on SUPERCHIP (and are inherited by XO-CHIP)
+SUPERCHIP_MNEMONICS = {
+    "SCD",  # 00Cn
+    "SCR",  # 00FB
+    "SCL",  # 00FC
+    "EXIT",  # 00FD
+    "LOW",  # 00FE
+    "HIGH",  # 00FF
+    "DRW16",  # Dxy0
+    "LD HF",  # Fx30
+    "LD R",  # Fx75
+    "LD VR",  # Fx85
+}
+
+# Instructions that only exist on XO-CHIP
+XOCHIP_MNEMONICS = {
+    "SCU",  # 00Dn
+    "SAVE",  # 5xy2
+    "LOAD",  # 5xy3
+    "LD I LONG",  # F000 nnnn
+    "PLANE",  # Fn01
+    "AUDIO",  # F002
+    "PITCH",  # Fx3A
+}
+
+
+def decode_opcode(opcode):
+    """Return the mnemonic for a 16-bit opcode, or None if it is not an instruction."""
+    family = opcode >> 12
+    n = opcode & 0x000F
+    nn = opcode & 0x00FF
+
+    if family == 0x0:
+        if opcode == 0x00E0:
+            return "CLS"
+        if opcode == 0x00EE:
+            return "RET"
+        if opcode & 0xFFF0 == 0x00C0:
+            return "SCD"
+        if opcode & 0xFFF0 == 0x00D0:
+            return "SCU"
+        if opcode == 0x00FB:
+            return "SCR"
+        if opcode == 0x00FC:
+            return "SCL"
+        if opcode == 0x00FD:
+            return "EXIT"
+        if opcode == 0x00FE:
+            return "LOW"
+        if opcode == 0x00FF:
+            return "HIGH"
+        return "SYS"
+    if family == 0x1:
+        return "JP"
+    if family == 0x2:
+        return "CALL"
+    if family == 0x3:
+        return "SE Vx, byte"
+    if family == 0x4:
+        return "SNE Vx, byte"
+    if family == 0x5:
+        return {0x0: "SE Vx, Vy", 0x2: "SAVE", 0x3: "LOAD"}.get(n)
+    if family == 0x6:
+        return "LD Vx, byte"
+    if family == 0x7:
+        return "ADD Vx, byte"
+    if family == 0x8:
+        return {
+            0x0: "LD Vx, Vy",
+            0x1: "OR",
+            0x2: "AND",
+            0x3: "XOR",
+            0x4: "ADD Vx, Vy",
+            0x5: "SUB",
+            0x6: "SHR",
+            0x7: "SUBN",
+            0xE: "SHL",
+        }.get(n)
+    if family == 0x9:
+        return "SNE Vx, Vy" if n == 0 else None
+    if family == 0xA:
+        return "LD I"
+    if family == 0xB:
+        return "JP V0"
+    if family == 0xC:
+        return "RND"
+    if family == 0xD:
+        return "DRW16" if n == 0 else "DRW"
+    if family == 0xE:
+        return {0x9E: "SKP", 0xA1: "SKNP"}.get(nn)
+    if opcode == 0xF000:
+        return "LD I LONG"
+    if opcode == 0xF002:
+        return "AUDIO"
+    if nn == 0x01:
+        return "PLANE"
+    return {
+        0x07: "LD Vx, DT",
+        0x0A: "LD K",
+        0x15: "LD DT, Vx",
+        0x18: "LD ST",
+        0x1E: "ADD I",
+        0x29: "LD F",
+        0x30: "LD HF",
+        0x33: "LD B",
+        0x3A: "PITCH",
+        0x55: "LD [I], Vx",
+        0x65: "LD Vx, [I]",
+        0x75: "LD R",
+        0x85: "LD VR",
+    }.get(nn)
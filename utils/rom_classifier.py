@@ -1,50 +1,224 @@
+import argparse
+import hashlib
+import json
 import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-if len(sys.argv) != 2:
-    print("Usage: python rename_roms.py <path_to_your_roms_directory>")
-    sys.exit(1)
+if not __package__:
+    # Allow running as `python utils/rom_classifier.py` as well as with -m
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Directory where your CHIP-8 ROMs are stored
-rom_directory = sys.argv[1]
+from utils.disassembler import CODE, ProgramAnalysis
+from utils.opcodes import SUPERCHIP_MNEMONICS, XOCHIP_MNEMONICS, decode_opcode
 
-# Byte patterns that are unique to SUPERCHIP and XO-CHIP, respectively
-# These are hypothetical examples; you'll need to replace them with the actual signatures
-superchip_signatures = [b"\x00\xC0", b"\xF0\x00"]
-xo_chip_signatures = [b"\x50\x40", b"\xF8\x00"]
+INDEX_FILENAME = ".rom_index.json"
+INDEX_VERSION = 2
 
+SYSTEM_PREFIXES = {
+    "CHIP8": "CHIP8_",
+    "SUPERCHIP": "SUPERCHIP_",
+    "XOCHIP": "XOCHIP_",
+}
 
-def check_for_signature(file_path, signatures):
-    with open(file_path, "rb") as file:
-        file_content = file.read()
-        for signature in signatures:
-            if signature in file_content:
-                return True
-    return False
 
+def analyze_rom(data):
+    """Classify a ROM image by the instructions reachable from its entry point.
 
-# Loop through all files in the directory
-for filename in os.listdir(rom_directory):
-    # Construct the full file path
-    file_path = os.path.join(rom_directory, filename)
+    Only instructions found by following the control flow are counted, so
+    sprite data that happens to look like an extended opcode is ignored.
+    The result is marked low confidence when the analysis may have missed
+    code, i.e. the ROM has indirect jumps or branches to undecodable words.
+    """
+    analysis = ProgramAnalysis(data)
+    opcodes = Counter(
+        decode_opcode(opcode) for opcode, size in analysis.instructions.values()
+    )
 
-    # Skip directories
-    if os.path.isdir(file_path):
-        continue
+    xochip = sorted(m for m in opcodes if m in XOCHIP_MNEMONICS)
+    superchip = sorted(m for m in opcodes if m in SUPERCHIP_MNEMONICS)
+    if xochip:
+        system = "XOCHIP"
+    elif superchip:
+        system = "SUPERCHIP"
+    else:
+        system = "CHIP8"
+
+    if analysis.indirect_jumps or analysis.invalid:
+        confidence = "low"
+    else:
+        confidence = "high"
+
+    return {
+        "system": system,
+        "confidence": confidence,
+        "size": len(data),
+        "code_bytes": analysis.byte_map.count(CODE),
+        "instructions": len(analysis.instructions),
+        "unknown": len(analysis.invalid),
+        "indirect_jumps": len(analysis.indirect_jumps),
+        "superchip_opcodes": superchip,
+        "xochip_opcodes": xochip,
+        "opcodes": dict(opcodes.most_common()),
+    }
+
+
+def load_index(index_path):
+    try:
+        with open(index_path, "r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("roms", {})
+
+
+def save_index(index_path, roms):
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"version": INDEX_VERSION, "roms": roms}, file, indent=1)
+    os.replace(tmp_path, index_path)
+
+
+def list_roms(rom_directory):
+    for filename in sorted(os.listdir(rom_directory)):
+        if filename.startswith("."):
+            continue
+        file_path = os.path.join(rom_directory, filename)
+        if os.path.isfile(file_path):
+            yield filename, file_path
+
+
+def classify_directory(rom_directory, workers=None, use_index=True):
+    """Classify every ROM in a directory, returning {filename: result}.
+
+    Results are cached in a sidecar index keyed by the SHA-1 of the ROM
+    contents, so only new or modified ROMs are decoded.
+    """
+    index_path = os.path.join(rom_directory, INDEX_FILENAME)
+    index = load_index(index_path) if use_index else {}
+
+    hashes = {}
+    pending = {}
+    for filename, file_path in list_roms(rom_directory):
+        with open(file_path, "rb") as file:
+            data = file.read()
+        digest = hashlib.sha1(data).hexdigest()
+        hashes[filename] = digest
+        if digest not in index and digest not in pending:
+            pending[digest] = data
+
+    if pending:
+        digests = list(pending)
+        if len(digests) == 1:
+            index[digests[0]] = analyze_rom(pending[digests[0]])
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                roms = [pending[digest] for digest in digests]
+                for digest, result in zip(
+                    digests, executor.map(analyze_rom, roms, chunksize=16)
+                ):
+                    index[digest] = result
+
+    if use_index:
+        # Drop entries for ROMs that are no longer in the directory
+        current = {digest: index[digest] for digest in set(hashes.values())}
+        if pending or len(current) != len(index):
+            save_index(index_path, current)
+
+    return {filename: index[digest] for filename, digest in hashes.items()}
+
+
+def strip_prefix(filename):
+    for prefix in SYSTEM_PREFIXES.values():
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+def rename_roms(rom_directory, results, file=sys.stdout):
+    for filename, result in results.items():
+        new_name = SYSTEM_PREFIXES[result["system"]] + strip_prefix(filename)
+        if new_name == filename:
+            continue
+        new_file_path = os.path.join(rom_directory, new_name)
+        if os.path.exists(new_file_path):
+            print(f"Skipped '{filename}': '{new_name}' already exists", file=file)
+            continue
+        os.rename(os.path.join(rom_directory, filename), new_file_path)
+        print(f"Renamed '{filename}' to '{new_name}'", file=file)
+
+
+def print_report(results, top):
+    for filename, result in results.items():
+        flagged = result["xochip_opcodes"] or result["superchip_opcodes"]
+        print(
+            f"{result['system']:<9} {filename}  "
+            f"({result['confidence']} confidence, {result['size']} bytes, "
+            f"{result['code_bytes']} code bytes, {result['instructions']} instructions)"
+        )
+        if result["unknown"] or result["indirect_jumps"]:
+            print(
+                f"    {result['indirect_jumps']} indirect jumps, "
+                f"{result['unknown']} undecodable branch targets"
+            )
+        if flagged:
+            print(f"    extended opcodes: {', '.join(flagged)}")
+        if top and result["opcodes"]:
+            common = list(result["opcodes"].items())[:top]
+            print("    " + ", ".join(f"{m}={count}" for m, count in common))
+    totals = Counter(result["system"] for result in results.values())
+    print(", ".join(f"{system}: {totals[system]}" for system in SYSTEM_PREFIXES))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Classify CHIP-8, SUPERCHIP and XO-CHIP ROMs by their opcodes."
+    )
+    parser.add_argument("rom_directory", help="directory containing the ROMs")
+    parser.add_argument(
+        "--rename",
+        action="store_true",
+        help="prefix each ROM with its system type instead of only reporting",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the full report as JSON"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="number of most common opcodes to show per ROM (default: 5)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="number of worker processes"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="ignore and do not update the index"
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.rom_directory):
+        parser.error(f"'{args.rom_directory}' is not a directory")
+
+    results = classify_directory(
+        args.rom_directory, workers=args.workers, use_index=not args.no_cache
+    )
 
-    # Check the ROM for each type of signature
-    if check_for_signature(file_path, xo_chip_signatures):
-        new_name = "XOCHIP_" + filename
-    elif check_for_signature(file_path, superchip_signatures):
-        new_name = "SUPERCHIP_" + filename
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
     else:
-        new_name = "CHIP8_" + filename
+        print_report(results, args.top)
 
-    # Construct the full new file path
-    new_file_path = os.path.join(rom_directory, new_name)
+    if args.rename:
+        # Keep stdout valid JSON when both options are given
+        rename_roms(
+            args.rom_directory, results, file=sys.stderr if args.json else sys.stdout
+        )
 
-    # Rename the file
-    os.rename(file_path, new_file_path)
-    print(f"Renamed '{filename}' to '{new_name}'")
 
-print("All ROMs have been checked and renamed accordingly.")
+if __name__ == "__main__":
+    main()
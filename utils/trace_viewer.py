@@ -0,0 +1,50 @@
+import argparse
+
+from system.debugger import load_trace
+from utils.disassembler import format_instruction
+
+
+def format_entry(entry, registers):
+    opcode = int(entry["opcode"])
+    if opcode == 0xF000:
+        # The trace does not record the address word that follows F000
+        text = "LD I, <long>"
+    else:
+        text = format_instruction(opcode)
+    line = f"{int(entry['pc']):03X}  {opcode:04X}  {text:<20} {int(entry['I']):03X}"
+    if registers:
+        line += "  " + " ".join(f"{int(v):02X}" for v in entry["V"])
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Print an execution trace dumped by the CHIP-8 debugger."
+    )
+    parser.add_argument("trace_file", help="trace file written by the debugger")
+    parser.add_argument(
+        "--last", type=int, default=0, help="only show the last N entries"
+    )
+    parser.add_argument(
+        "--pc", type=lambda value: int(value, 0), help="only show entries at this PC"
+    )
+    parser.add_argument(
+        "--no-registers", action="store_true", help="do not print V0-VF"
+    )
+    args = parser.parse_args(argv)
+
+    entries = load_trace(args.trace_file)
+    if args.pc is not None:
+        entries = entries[entries["pc"] == args.pc]
+    if args.last:
+        entries = entries[-args.last :]
+
+    if not args.no_registers:
+        header = " ".join(f"V{i:X}" for i in range(16))
+        print(f"{'PC':<3}  {'OP':<4}  {'INSTRUCTION':<20} {'I':<3}  {header}")
+    for entry in entries:
+        print(format_entry(entry, not args.no_registers))
+
+
+if __name__ == "__main__":
+    main()